@@ -1,6 +1,8 @@
 import streamlit as st
 import pandas as pd
 import nfl_data_py as nfl
+from base_table import build_base_table, select_plays, TEAM_STATS_MASK
+from ttl_cache import ttl_cache, season_ttl, CURRENT_SEASON_PBP_TTL
 
 st.set_page_config(page_title="NFL Performance Dashboard 2025", layout="wide")
 
@@ -10,12 +12,23 @@ This dashboard analyzes play-by-play data from the 2025 season using `nfl_data_p
 Data is filtered for regular season games and excludes garbage time (Win Probability < 5% or > 95%).
 """)
 
-@st.cache_data
+# TTL-cached instead of st.cache_data so in-season data expires and refreshes in the
+# background; these run on refresh threads, so they must not call st.* directly.
+@ttl_cache(ttl=season_ttl(CURRENT_SEASON_PBP_TTL))
+def fetch_pbp_data(year):
+    """Loads a season of PBP data as a base table with precomputed filter flags."""
+    return build_base_table(nfl.import_pbp_data([year]))
+
+@ttl_cache()
+def fetch_team_desc():
+    """Loads team descriptions (static, never expires)."""
+    return nfl.import_team_desc()
+
 def load_data():
     # Load play-by-play data for 2025
     with st.spinner('Loading 2025 Play-by-Play data...'):
         try:
-            df = nfl.import_pbp_data([2025])
+            df = fetch_pbp_data(2025)
         except Exception as e:
             st.error(f"Error loading PBP data: {e}")
             return pd.DataFrame(), pd.DataFrame()
@@ -23,7 +36,7 @@ def load_data():
     # Load team descriptions for logos
     with st.spinner('Loading Team Data...'):
         try:
-            teams_df = nfl.import_team_desc()
+            teams_df = fetch_team_desc()
         except Exception as e:
             st.error(f"Error loading Team data: {e}")
             return df, pd.DataFrame()
@@ -31,37 +44,17 @@ def load_data():
     return df, teams_df
 
 def prepare_data(df):
-    """Filters data and adds helper columns for aggregation."""
+    """Selects the plays used for aggregation from a base table (see build_base_table)."""
     if df.empty:
         return df
 
-    # Filter for Regular Season
-    df_reg = df[df['season_type'] == 'REG'].copy()
-    
-    # Standard Filters (RBSDM style)
-    # 1. WP between 5-95% (Garbage Time)
+    # Standard Filters (RBSDM style), precomputed as flags in the base table
+    # 1. Regular Season only
     # 2. Must be a pass or run play (pass=1 or rush=1)
     # 3. Exclude Kneels, Spikes, Two-Point Attempts, Aborted Plays
-    df_filtered = df_reg[
-        # (df_reg['wp'] >= 0.05) & 
-        # (df_reg['wp'] <= 0.95) &
-        ((df_reg['pass'] == 1) | (df_reg['rush'] == 1)) &
-        (df_reg['qb_kneel'] == 0) & 
-        (df_reg['qb_spike'] == 0) & 
-        (df_reg['two_point_attempt'] == 0) & 
-        (df_reg['aborted_play'] == 0) &
-        (df_reg['posteam'].notna()) &
-        (df_reg['defteam'].notna()) &
-        (df_reg['epa'].notna())
-    ].copy()
-    
-    # Pre-calculate conditional columns for easier aggregation
-    df_filtered['pass_epa'] = df_filtered.loc[df_filtered['pass'] == 1, 'epa']
-    df_filtered['rush_epa'] = df_filtered.loc[df_filtered['rush'] == 1, 'epa']
-    df_filtered['pass_yards'] = df_filtered.loc[df_filtered['pass'] == 1, 'yards_gained']
-    df_filtered['rush_yards'] = df_filtered.loc[df_filtered['rush'] == 1, 'yards_gained']
-    
-    return df_filtered
+    # 4. Non-null teams and EPA
+    # Garbage time (WP 5-95%) is not filtered; add NEUTRAL_WP to the mask to exclude it.
+    return select_plays(df, TEAM_STATS_MASK)
 
 def calculate_metrics(df, group_col):
     """Aggregates statistics based on the grouping column (posteam or defteam)."""
@@ -153,7 +146,7 @@ def export_stats():
     print("Loading 2025 PBP Data for Export...")
     try:
         # Load data directly without st.cache
-        df = nfl.import_pbp_data([2025])
+        df = build_base_table(nfl.import_pbp_data([2025]))
     except Exception as e:
         print(f"Error loading data: {e}")
         return
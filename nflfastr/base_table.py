@@ -0,0 +1,90 @@
+import numpy as np
+
+# --- Play Filter Flags ---
+# Each filter predicate is evaluated once per season and packed into a single
+# integer column. A pipeline selects its rows by OR-ing the flags it needs into
+# a mask and keeping rows where (play_flags & mask) == mask.
+
+FLAGS_COL = 'play_flags'
+
+REG_SEASON = 1 << 0         # season_type == 'REG'
+PASS_OR_RUSH = 1 << 1       # pass == 1 or rush == 1
+PASS_OR_RUN_TYPE = 1 << 2   # play_type in ('pass', 'run')
+NO_KNEEL = 1 << 3           # qb_kneel == 0
+NO_SPIKE = 1 << 4           # qb_spike == 0
+NO_TWO_POINT = 1 << 5       # two_point_attempt == 0
+NOT_ABORTED = 1 << 6        # aborted_play == 0
+HAS_TEAMS = 1 << 7          # posteam and defteam are not null
+HAS_EPA = 1 << 8            # epa is not null
+NEUTRAL_WP = 1 << 9         # 0.05 <= wp <= 0.95 (excludes garbage time)
+
+# Season-level team stats (RBSDM style, garbage time included)
+TEAM_STATS_MASK = (
+    REG_SEASON | PASS_OR_RUSH | NO_KNEEL | NO_SPIKE |
+    NO_TWO_POINT | NOT_ABORTED | HAS_TEAMS | HAS_EPA
+)
+
+# Single-game analysis (garbage time excluded)
+GAME_ANALYSIS_MASK = NEUTRAL_WP | PASS_OR_RUN_TYPE | NO_KNEEL | NO_SPIKE
+
+
+def _flag(condition, bit):
+    return np.where(condition.to_numpy(dtype=bool, na_value=False), bit, 0).astype(np.uint16)
+
+
+def build_base_table(df):
+    """Adds the packed filter flags and derived pass/run columns to a season of PBP data.
+
+    Columns are added in place so the (large) season frame is never copied;
+    pass a frame the caller owns, e.g. straight from nfl.import_pbp_data.
+    """
+    if FLAGS_COL in df.columns:
+        return df
+
+    flags = (
+        _flag(df['season_type'] == 'REG', REG_SEASON) |
+        _flag((df['pass'] == 1) | (df['rush'] == 1), PASS_OR_RUSH) |
+        _flag(df['play_type'].isin(['pass', 'run']), PASS_OR_RUN_TYPE) |
+        _flag(df['qb_kneel'] == 0, NO_KNEEL) |
+        _flag(df['qb_spike'] == 0, NO_SPIKE) |
+        _flag(df['two_point_attempt'] == 0, NO_TWO_POINT) |
+        _flag(df['aborted_play'] == 0, NOT_ABORTED) |
+        _flag(df['posteam'].notna() & df['defteam'].notna(), HAS_TEAMS) |
+        _flag(df['epa'].notna(), HAS_EPA) |
+        _flag((df['wp'] >= 0.05) & (df['wp'] <= 0.95), NEUTRAL_WP)
+    )
+
+    is_pass_play = df['pass'] == 1
+    is_rush_play = df['rush'] == 1
+    derived = {
+        # Run/Pass definitions used by the game analysis splits
+        'is_pass': np.where(df['qb_dropback'] == 1, 1, 0),
+        'is_run': np.where((df['play_type'] == 'run') & (df['qb_dropback'] == 0), 1, 0),
+        # Conditional columns for season aggregation (NaN when not applicable)
+        'pass_epa': df['epa'].where(is_pass_play),
+        'rush_epa': df['epa'].where(is_rush_play),
+        'pass_yards': df['yards_gained'].where(is_pass_play),
+        'rush_yards': df['yards_gained'].where(is_rush_play),
+    }
+
+    # Everything is computed before the frame is touched, and the flags column
+    # (which marks the table as built) is written last, so a missing input
+    # column never leaves a half-built table behind.
+    for col, values in derived.items():
+        df[col] = values
+    df[FLAGS_COL] = flags
+
+    return df
+
+
+def flag_mask(df, mask):
+    """Returns a boolean array selecting rows where every flag in mask is set."""
+    return (df[FLAGS_COL].to_numpy() & mask) == mask
+
+
+def select_plays(df, mask, rows=None):
+    """Selects rows matching mask (optionally AND-ed with an extra boolean row filter)."""
+    keep = flag_mask(df, mask)
+    if rows is not None:
+        keep &= np.asarray(rows, dtype=bool)
+    return df[keep]
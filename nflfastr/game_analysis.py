@@ -8,6 +8,8 @@ import argparse
 import json
 import os
 import contextlib
+from base_table import build_base_table, select_plays, GAME_ANALYSIS_MASK
+from ttl_cache import ttl_cache, season_ttl, cache_stats, CURRENT_SEASON_PBP_TTL, CURRENT_SEASON_SCHEDULE_TTL
 
 @contextlib.contextmanager
 def suppress_stdout():
@@ -40,17 +42,31 @@ def cache_data_wrapper(func):
     return func
 
 # --- Data Loading with Caching ---
+# Schedule and PBP go through the TTL cache so the current season refreshes in
+# the background; past seasons are cached for the life of the process.
 
-@cache_data_wrapper
+# Local fixture data source (schedule_<year>.pkl / pbp_<year>.pkl), used by
+# load_test.py to run without network access. Unset in normal operation.
+FIXTURE_DIR = os.environ.get("NFLFASTR_FIXTURE_DIR")
+
+def read_fixture(kind, year):
+    """Loads a pickled fixture frame from FIXTURE_DIR."""
+    return pd.read_pickle(os.path.join(FIXTURE_DIR, f"{kind}_{year}.pkl"))
+
+@ttl_cache(ttl=season_ttl(CURRENT_SEASON_SCHEDULE_TTL))
 def load_schedule(year):
     """Loads schedule data."""
+    if FIXTURE_DIR:
+        return read_fixture('schedule', year)
     df = nfl.import_schedules([year])
     return df
 
-@cache_data_wrapper
+@ttl_cache(ttl=season_ttl(CURRENT_SEASON_PBP_TTL))
 def load_pbp_data(year):
-    """Loads PBP data for the entire season."""
-    df = nfl.import_pbp_data([year])
+    """Loads PBP data for the entire season as a base table with precomputed filter flags."""
+    if FIXTURE_DIR:
+        return build_base_table(read_fixture('pbp', year))
+    df = build_base_table(nfl.import_pbp_data([year]))
     return df
 
 @cache_data_wrapper
@@ -142,33 +158,23 @@ def get_team_player_stats(df, team_abbr):
     return passing_stats, rushing_stats, receiving_stats
 
 def process_game_data(game_id, season, pbp_season=None):
-    """Processes PBP data for a specific game."""
+    """Processes PBP data for a specific game.
+
+    pbp_season must be a base table (as returned by load_pbp_data); it is only
+    read from, never modified.
+    """
     if pbp_season is None:
         pbp_season = load_pbp_data(season)
-    
+
     # Filter for selected game
-    game_data = pbp_season[pbp_season['game_id'] == game_id].copy()
+    in_game = (pbp_season['game_id'] == game_id).to_numpy()
 
-    if game_data.empty:
+    if not in_game.any():
         return None
 
-    # Filter Garbage Time (WP 5-95%)
-    game_data_filtered = game_data[
-        (game_data['wp'] >= 0.05) & (game_data['wp'] <= 0.95)
-    ]
-
-    # Filter Non-Plays
-    game_data_filtered = game_data_filtered[
-        (game_data_filtered['play_type'].isin(['pass', 'run'])) &
-        (game_data_filtered['qb_kneel'] == 0) &
-        (game_data_filtered['qb_spike'] == 0)
-    ]
-
-    # Define Run/Pass
-    game_data_filtered['is_pass'] = np.where(game_data_filtered['qb_dropback'] == 1, 1, 0)
-    game_data_filtered['is_run'] = np.where(
-        (game_data_filtered['play_type'] == 'run') & (game_data_filtered['qb_dropback'] == 0), 1, 0
-    )
+    # Filter Garbage Time (WP 5-95%) and Non-Plays (kneels, spikes, non pass/run)
+    # in one mask over the shared base table; is_pass/is_run are precomputed there.
+    game_data_filtered = select_plays(pbp_season, GAME_ANALYSIS_MASK, rows=in_game)
     
     return game_data_filtered
 
@@ -368,35 +374,38 @@ def run_streamlit_app():
     with st.expander("Raw Data Snippet"):
         st.dataframe(game_data_filtered[['posteam', 'down', 'ydstogo', 'desc', 'play_type', 'epa']].head(20))
 
-def run_cli_mode(game_id):
+def analyze_game(game_id, quiet=True):
+    """Builds the game analysis payload for game_id; failures are reported under an 'error' key.
+
+    quiet silences loader output by swapping sys.stdout, which is process-wide;
+    pass quiet=False when calling from several threads at once.
+    """
+    quiet_output = suppress_stdout if quiet else contextlib.nullcontext
     # Derive season from game_id (assuming format YYYY_WW_AWAY_HOME)
     try:
         season = int(game_id.split('_')[0])
     except (IndexError, ValueError):
         # Fallback or error
-        print(json.dumps({"error": "Invalid game_id format. Expected YYYY_WW_AWAY_HOME."}))
-        return
+        return {"error": "Invalid game_id format. Expected YYYY_WW_AWAY_HOME."}
 
     try:
-        with suppress_stdout():
+        with quiet_output():
             schedule = load_schedule(season)
         game_info = schedule[schedule['game_id'] == game_id]
         
         if game_info.empty:
-            print(json.dumps({"error": f"Game ID {game_id} not found in {season} schedule."}))
-            return
+            return {"error": f"Game ID {game_id} not found in {season} schedule."}
 
         home_team = game_info.iloc[0]['home_team']
         away_team = game_info.iloc[0]['away_team']
 
-        with suppress_stdout():
+        with quiet_output():
             pbp_season = load_pbp_data(season)
             
         game_data_filtered = process_game_data(game_id, season, pbp_season)
         
         if game_data_filtered is None or game_data_filtered.empty:
-             print(json.dumps({"error": "No play-by-play data found for this game."}))
-             return
+             return {"error": "No play-by-play data found for this game."}
 
         # Calculate Stats
         home_stats = get_team_stats(game_data_filtered, home_team)
@@ -406,7 +415,7 @@ def run_cli_mode(game_id):
         away_passing, away_rushing, away_receiving = get_team_player_stats(game_data_filtered, away_team)
 
         # Construct JSON
-        output = {
+        return {
             "game_id": game_id,
             "season": season,
             "home_team": home_team,
@@ -428,18 +437,27 @@ def run_cli_mode(game_id):
                 }
             }
         }
-        
-        # Helper to handle NaN for JSON serialization
-        def json_serial(obj):
-            if isinstance(obj, (np.integer, np.floating, float)):
-                if np.isnan(obj): return None
-                return float(obj)
-            if isinstance(obj, np.ndarray):
-                return obj.tolist()
-            return str(obj)
 
-        print(json.dumps(output, default=json_serial, indent=4))
+    except Exception as e:
+        return {"error": str(e)}
+
+# Helper to handle NaN for JSON serialization
+def json_serial(obj):
+    if isinstance(obj, (np.integer, np.floating, float)):
+        if np.isnan(obj): return None
+        return float(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    return str(obj)
+
+def run_cli_mode(game_id):
+    output = analyze_game(game_id)
+    if "error" in output:
+        print(json.dumps(output))
+        return
 
+    try:
+        print(json.dumps(output, default=json_serial, indent=4))
     except Exception as e:
         print(json.dumps({"error": str(e)}))
 
@@ -455,5 +473,9 @@ if __name__ == "__main__":
         args, unknown = parser.parse_known_args()
         
         run_cli_mode(args.game_id)
+
+        # Cache counters for load_test.py, kept off stdout which carries the JSON payload
+        if os.environ.get("NFLFASTR_CACHE_STATS"):
+            print(json.dumps({"cache_stats": cache_stats()}), file=sys.stderr)
     else:
         run_streamlit_app()
\ No newline at end of file
@@ -0,0 +1,320 @@
+"""Concurrent load test for the game analysis CLI path.
+
+Drives game_analysis.run_cli_mode against a local fixture data source, either
+as one `python game_analysis.py --game_id ...` subprocess per request (the CLI
+entry point) or in-process on a thread pool, and writes throughput,
+latency percentiles, peak RSS and cache hit rates as JSON.
+
+Fixtures are written in a separate step so their memory use never shows up in
+a run's peak RSS.
+
+Examples:
+    python load_test.py --fixture-dir /tmp/nfl_fixture --generate --seasons 2023 2024
+    python load_test.py --fixture-dir /tmp/nfl_fixture --mode inprocess --mix week --concurrency 8
+    python load_test.py --fixture-dir /tmp/nfl_fixture --mode subprocess --mix mixed --output results.json
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+GAME_ANALYSIS_PATH = os.path.join(SCRIPT_DIR, 'game_analysis.py')
+
+TEAMS = [
+    'ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE', 'DAL', 'DEN', 'DET', 'GB', 'HOU', 'IND', 'JAX', 'KC',
+    'LA', 'LAC', 'LV', 'MIA', 'MIN', 'NE', 'NO', 'NYG', 'NYJ', 'PHI', 'PIT', 'SEA', 'SF', 'TB', 'TEN', 'WAS'
+]
+
+# --- Fixture Data Source ---
+
+def generate_fixture(fixture_dir, seasons, weeks=18, plays_per_game=160, seed=0):
+    """Writes synthetic schedule/PBP pickles with the columns game_analysis reads."""
+    os.makedirs(fixture_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+
+    for season in seasons:
+        games = []
+        for week in range(1, weeks + 1):
+            order = rng.permutation(TEAMS)
+            for away, home in zip(order[::2], order[1::2]):
+                games.append({
+                    'game_id': f"{season}_{week:02d}_{away}_{home}",
+                    'season': season,
+                    'game_type': 'REG',
+                    'week': week,
+                    'away_team': away,
+                    'home_team': home,
+                })
+        schedule = pd.DataFrame(games)
+
+        n = len(schedule) * plays_per_game
+        game_idx = np.repeat(np.arange(len(schedule)), plays_per_game)
+        offense_is_home = rng.integers(0, 2, n).astype(bool)
+        home = schedule['home_team'].to_numpy()[game_idx]
+        away = schedule['away_team'].to_numpy()[game_idx]
+        posteam = np.where(offense_is_home, home, away)
+        defteam = np.where(offense_is_home, away, home)
+
+        play_type = rng.choice(['pass', 'run', 'punt', 'field_goal', 'no_play'], n, p=[0.55, 0.35, 0.04, 0.03, 0.03])
+        is_pass = play_type == 'pass'
+        is_run = play_type == 'run'
+        epa = rng.normal(0.0, 1.3, n)
+
+        pbp = pd.DataFrame({
+            'play_id': np.arange(n),
+            'game_id': schedule['game_id'].to_numpy()[game_idx],
+            'season': season,
+            'week': schedule['week'].to_numpy()[game_idx],
+            'season_type': 'REG',
+            'posteam': posteam,
+            'defteam': defteam,
+            'play_type': play_type,
+            'pass': is_pass.astype(float),
+            'rush': is_run.astype(float),
+            'pass_attempt': is_pass.astype(float),
+            'rush_attempt': is_run.astype(float),
+            'qb_dropback': is_pass.astype(float),
+            'qb_kneel': (is_run & (rng.random(n) < 0.01)).astype(float),
+            'qb_spike': (is_pass & (rng.random(n) < 0.005)).astype(float),
+            'two_point_attempt': 0.0,
+            'aborted_play': 0.0,
+            'down': rng.integers(1, 5, n).astype(float),
+            'ydstogo': rng.integers(1, 16, n).astype(float),
+            'yards_gained': rng.integers(-5, 25, n).astype(float),
+            'epa': epa,
+            'success': (epa > 0).astype(float),
+            'first_down': (rng.random(n) < 0.25).astype(float),
+            'wp': rng.uniform(0.01, 0.99, n),
+            'passer_player_name': np.where(is_pass, pd.Series(posteam) + '_QB1', None),
+            'rusher_player_name': np.where(is_run, pd.Series(posteam) + '_RB' + rng.integers(1, 3, n).astype(str), None),
+            'receiver_player_name': np.where(is_pass & (rng.random(n) < 0.9), pd.Series(posteam) + '_WR' + rng.integers(1, 4, n).astype(str), None),
+            'desc': 'synthetic play',
+        })
+
+        schedule.to_pickle(os.path.join(fixture_dir, f"schedule_{season}.pkl"))
+        pbp.to_pickle(os.path.join(fixture_dir, f"pbp_{season}.pkl"))
+        print(f"Wrote fixture for {season}: {len(schedule)} games, {n} plays", file=sys.stderr)
+
+
+def snapshot_fixture(fixture_dir, seasons):
+    """Downloads real schedule/PBP data once via nfl_data_py and stores it as a fixture."""
+    import nfl_data_py as nfl
+
+    os.makedirs(fixture_dir, exist_ok=True)
+    for season in seasons:
+        nfl.import_schedules([season]).to_pickle(os.path.join(fixture_dir, f"schedule_{season}.pkl"))
+        nfl.import_pbp_data([season]).to_pickle(os.path.join(fixture_dir, f"pbp_{season}.pkl"))
+        print(f"Wrote snapshot fixture for {season}", file=sys.stderr)
+
+
+def fixture_seasons(fixture_dir):
+    return sorted(
+        int(name[len('schedule_'):-len('.pkl')])
+        for name in os.listdir(fixture_dir)
+        if name.startswith('schedule_') and name.endswith('.pkl')
+    )
+
+# --- Request Mix ---
+
+def build_requests(fixture_dir, mix, num_requests, seed=0):
+    """Returns the list of game_ids to request for the given mix."""
+    seasons = fixture_seasons(fixture_dir)
+    if not seasons:
+        raise SystemExit(f"No fixture schedules found in {fixture_dir}")
+
+    schedule = pd.read_pickle(os.path.join(fixture_dir, f"schedule_{seasons[0]}.pkl")).sort_values('game_id')
+
+    if mix == 'same':
+        # One game repeated: best case for the season caches
+        game_ids = [schedule['game_id'].iloc[0]]
+    elif mix == 'week':
+        # Every game in one week, as when a week's dashboard fans out to all game pages
+        week = schedule['week'].min()
+        game_ids = schedule.loc[schedule['week'] == week, 'game_id'].tolist()
+    else:
+        # Random games across all fixture seasons
+        all_games = pd.concat(
+            [pd.read_pickle(os.path.join(fixture_dir, f"schedule_{s}.pkl"))['game_id'] for s in seasons]
+        )
+        rng = np.random.default_rng(seed)
+        return rng.choice(all_games.to_numpy(), num_requests).tolist()
+
+    return [game_ids[i % len(game_ids)] for i in range(num_requests)]
+
+# --- Runners ---
+
+def _loader_name(name):
+    # game_analysis runs as __main__ in subprocess mode; key by function so reports compare across modes
+    return name.rsplit('.', 1)[-1]
+
+
+def _peak_rss_mb(who):
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_subprocess(game_ids, concurrency, fixture_dir):
+    env = dict(os.environ, NFLFASTR_FIXTURE_DIR=fixture_dir, NFLFASTR_CACHE_STATS='1')
+
+    def one(game_id):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, GAME_ANALYSIS_PATH, '--game_id', game_id],
+            env=env, capture_output=True, text=True
+        )
+        latency = time.perf_counter() - start
+
+        ok = proc.returncode == 0
+        if ok:
+            try:
+                ok = 'error' not in json.loads(proc.stdout)
+            except ValueError:
+                ok = False
+
+        stats = {}
+        for line in reversed(proc.stderr.splitlines()):
+            if line.startswith('{"cache_stats"'):
+                stats = json.loads(line)['cache_stats']
+                break
+        return latency, ok, stats
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, game_ids))
+
+    # Every request runs in a fresh process, so sum the per-process counters
+    cache = {}
+    for _, _, stats in results:
+        for name, counters in stats.items():
+            total = cache.setdefault(_loader_name(name), {})
+            for key, value in counters.items():
+                if key != 'hit_rate':
+                    total[key] = total.get(key, 0) + value
+    for counters in cache.values():
+        lookups = counters['hits'] + counters['stale_hits'] + counters['misses']
+        counters['hit_rate'] = (counters['hits'] + counters['stale_hits']) / lookups if lookups else None
+
+    # Largest single worker process; workers are the only children of this process
+    memory = {'peak_rss_mb': _peak_rss_mb(resource.RUSAGE_CHILDREN)}
+    return [(latency, ok) for latency, ok, _ in results], cache, memory
+
+
+def run_inprocess(game_ids, concurrency, fixture_dir):
+    # game_analysis reads the fixture location at import time
+    os.environ['NFLFASTR_FIXTURE_DIR'] = fixture_dir
+    sys.path.insert(0, SCRIPT_DIR)
+    import game_analysis
+    import ttl_cache
+
+    ttl_cache.clear_caches()
+
+    def one(game_id):
+        start = time.perf_counter()
+        # quiet=False: suppress_stdout swaps the process-wide sys.stdout and is not thread safe
+        output = game_analysis.analyze_game(game_id, quiet=False)
+        # run_cli_mode prints its payload; keep it off the report but still pay for serialization
+        json.dumps(output, default=game_analysis.json_serial, indent=4)
+        return time.perf_counter() - start, 'error' not in output
+
+    # Imports and request building already raised the high-water mark, so report growth from here
+    baseline_rss_mb = _peak_rss_mb(resource.RUSAGE_SELF)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, game_ids))
+    peak_rss_mb = _peak_rss_mb(resource.RUSAGE_SELF)
+
+    cache = {_loader_name(name): stats for name, stats in ttl_cache.cache_stats().items()}
+    memory = {
+        'peak_rss_mb': peak_rss_mb,
+        'baseline_rss_mb': baseline_rss_mb,
+        'rss_increase_mb': peak_rss_mb - baseline_rss_mb,
+    }
+    return results, cache, memory
+
+
+def summarize(results, wall_time):
+    latencies_ms = np.array([latency for latency, _ in results]) * 1000
+    errors = sum(1 for _, ok in results if not ok)
+    return {
+        'requests': len(results),
+        'errors': errors,
+        'wall_time_s': wall_time,
+        'throughput_rps': len(results) / wall_time if wall_time else None,
+        'latency_ms': {
+            'mean': float(latencies_ms.mean()),
+            'p50': float(np.percentile(latencies_ms, 50)),
+            'p95': float(np.percentile(latencies_ms, 95)),
+            'p99': float(np.percentile(latencies_ms, 99)),
+            'max': float(latencies_ms.max()),
+        },
+    }
+
+# --- Main ---
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for the game analysis CLI")
+    parser.add_argument("--fixture-dir", required=True, help="Directory holding schedule_<year>.pkl / pbp_<year>.pkl")
+    parser.add_argument("--generate", action="store_true", help="Write a synthetic fixture for --seasons and exit")
+    parser.add_argument("--snapshot", action="store_true", help="Download real data for --seasons into the fixture and exit")
+    parser.add_argument("--seasons", type=int, nargs="+", default=[2024], help="Seasons for --generate/--snapshot")
+    parser.add_argument("--mode", choices=["subprocess", "inprocess"], default="subprocess")
+    parser.add_argument("--mix", choices=["same", "week", "mixed"], default="week")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.requests < 1:
+        parser.error("--requests must be at least 1")
+
+    fixture_dir = os.path.abspath(args.fixture_dir)
+    if args.generate:
+        generate_fixture(fixture_dir, args.seasons, seed=args.seed)
+        return
+    if args.snapshot:
+        snapshot_fixture(fixture_dir, args.seasons)
+        return
+
+    game_ids = build_requests(fixture_dir, args.mix, args.requests, seed=args.seed)
+    runner = run_subprocess if args.mode == 'subprocess' else run_inprocess
+
+    start = time.perf_counter()
+    results, cache, memory = runner(game_ids, args.concurrency, fixture_dir)
+    wall_time = time.perf_counter() - start
+
+    report = {
+        'config': {
+            'mode': args.mode,
+            'mix': args.mix,
+            'concurrency': args.concurrency,
+            'requests': args.requests,
+            'unique_games': len(set(game_ids)),
+            'fixture_dir': fixture_dir,
+            'seasons': fixture_seasons(fixture_dir),
+        },
+        **summarize(results, wall_time),
+        # subprocess: largest single worker process; inprocess: this process, plus growth during the run
+        **memory,
+        'cache': cache,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote load test report to {args.output}", file=sys.stderr)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from base_table import (
+    build_base_table, select_plays, FLAGS_COL, TEAM_STATS_MASK, GAME_ANALYSIS_MASK
+)
+
+
+def make_pbp(n=4000, seed=0):
+    """Random PBP frame including NaN wp/epa/kneel/dropback and missing teams."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'game_id': rng.choice(['g1', 'g2', 'g3'], n),
+        'season_type': rng.choice(['REG', 'POST'], n),
+        'pass': rng.integers(0, 2, n).astype(float),
+        'rush': rng.integers(0, 2, n).astype(float),
+        'play_type': rng.choice(['pass', 'run', 'punt', None], n),
+        'qb_kneel': rng.choice([0, 1, np.nan], n),
+        'qb_spike': rng.choice([0, 1], n, p=[0.9, 0.1]),
+        'two_point_attempt': rng.choice([0, 1], n, p=[0.9, 0.1]),
+        'aborted_play': rng.choice([0, 1], n, p=[0.9, 0.1]),
+        'posteam': rng.choice(['A', 'B', None], n),
+        'defteam': rng.choice(['A', 'B', None], n),
+        'epa': np.where(rng.random(n) < 0.1, np.nan, rng.normal(size=n)),
+        'wp': np.where(rng.random(n) < 0.05, np.nan, rng.random(n)),
+        'qb_dropback': rng.choice([0, 1, np.nan], n),
+        'yards_gained': rng.integers(-5, 30, n).astype(float),
+    })
+
+
+# Reference implementations: the filters as written before the base table existed
+
+def baseline_prepare_data(df):
+    df_reg = df[df['season_type'] == 'REG'].copy()
+    df_filtered = df_reg[
+        ((df_reg['pass'] == 1) | (df_reg['rush'] == 1)) &
+        (df_reg['qb_kneel'] == 0) &
+        (df_reg['qb_spike'] == 0) &
+        (df_reg['two_point_attempt'] == 0) &
+        (df_reg['aborted_play'] == 0) &
+        (df_reg['posteam'].notna()) &
+        (df_reg['defteam'].notna()) &
+        (df_reg['epa'].notna())
+    ].copy()
+    df_filtered['pass_epa'] = df_filtered.loc[df_filtered['pass'] == 1, 'epa']
+    df_filtered['rush_epa'] = df_filtered.loc[df_filtered['rush'] == 1, 'epa']
+    df_filtered['pass_yards'] = df_filtered.loc[df_filtered['pass'] == 1, 'yards_gained']
+    df_filtered['rush_yards'] = df_filtered.loc[df_filtered['rush'] == 1, 'yards_gained']
+    return df_filtered
+
+
+def baseline_process_game_data(df, game_id):
+    game_data = df[df['game_id'] == game_id].copy()
+    game_data_filtered = game_data[(game_data['wp'] >= 0.05) & (game_data['wp'] <= 0.95)]
+    game_data_filtered = game_data_filtered[
+        (game_data_filtered['play_type'].isin(['pass', 'run'])) &
+        (game_data_filtered['qb_kneel'] == 0) &
+        (game_data_filtered['qb_spike'] == 0)
+    ].copy()
+    game_data_filtered['is_pass'] = np.where(game_data_filtered['qb_dropback'] == 1, 1, 0)
+    game_data_filtered['is_run'] = np.where(
+        (game_data_filtered['play_type'] == 'run') & (game_data_filtered['qb_dropback'] == 0), 1, 0
+    )
+    return game_data_filtered
+
+
+def test_team_stats_mask_matches_baseline():
+    raw = make_pbp()
+    expected = baseline_prepare_data(raw)
+
+    selected = select_plays(build_base_table(raw.copy()), TEAM_STATS_MASK)
+
+    pd.testing.assert_frame_equal(selected[expected.columns], expected)
+
+
+@pytest.mark.parametrize('game_id', ['g1', 'g2', 'g3'])
+def test_game_analysis_mask_matches_baseline(game_id):
+    raw = make_pbp()
+    expected = baseline_process_game_data(raw, game_id)
+
+    base = build_base_table(raw.copy())
+    selected = select_plays(base, GAME_ANALYSIS_MASK, rows=(base['game_id'] == game_id).to_numpy())
+
+    pd.testing.assert_frame_equal(selected[expected.columns], expected)
+
+
+def test_select_plays_does_not_modify_base_table():
+    base = build_base_table(make_pbp())
+    before = base.copy()
+
+    select_plays(base, TEAM_STATS_MASK)
+    select_plays(base, GAME_ANALYSIS_MASK, rows=(base['game_id'] == 'g1').to_numpy())
+
+    pd.testing.assert_frame_equal(base, before)
+
+
+def test_failed_build_leaves_frame_untouched():
+    raw = make_pbp().drop(columns=['yards_gained'])
+    columns = list(raw.columns)
+
+    with pytest.raises(KeyError):
+        build_base_table(raw)
+
+    assert list(raw.columns) == columns
+    assert FLAGS_COL not in raw.columns
@@ -0,0 +1,157 @@
+import datetime
+import threading
+
+import pandas as pd
+import pytest
+
+from ttl_cache import TTLCache, season_finished, season_ttl
+
+TTL = 60
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeSource:
+    """Local data source returning a different frame on every fetch.
+
+    Fetches after the first block on `release` so tests can observe the cache
+    while a background refresh is in flight.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+        self.fail = False
+        self._lock = threading.Lock()
+
+    def fetch(self):
+        with self._lock:
+            self.calls += 1
+            version = self.calls
+        if version > 1:
+            self.release.wait(5)
+        if self.fail:
+            raise RuntimeError("source unavailable")
+        return pd.DataFrame({'version': [version]})
+
+
+def version(df):
+    return int(df['version'].iloc[0])
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def source():
+    return FakeSource()
+
+
+@pytest.fixture
+def cache(clock):
+    return TTLCache(clock=clock)
+
+
+def test_cold_miss_loads_synchronously(cache, source):
+    assert version(cache.get('pbp', source.fetch, TTL)) == 1
+    assert source.calls == 1
+
+    assert version(cache.get('pbp', source.fetch, TTL)) == 1
+    assert source.calls == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_expired_entry_serves_stale_while_one_refresh_runs(cache, clock, source):
+    cache.get('pbp', source.fetch, TTL)
+    clock.now = TTL + 1
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(version(cache.get('pbp', source.fetch, TTL))))
+        for _ in range(16)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [1] * 16
+    assert source.calls == 2
+    refresh_threads = [t for t in threading.enumerate() if t.name.startswith('ttl-cache-refresh-')]
+    assert len(refresh_threads) == 1
+
+    source.release.set()
+    cache.join()
+
+
+def test_refreshed_frame_is_served_after_join(cache, clock, source):
+    cache.get('pbp', source.fetch, TTL)
+    clock.now = TTL + 1
+    assert version(cache.get('pbp', source.fetch, TTL)) == 1
+
+    source.release.set()
+    cache.join()
+
+    assert version(cache.get('pbp', source.fetch, TTL)) == 2
+    assert cache.stats()['refreshes'] == 1
+
+
+def test_failed_refresh_keeps_old_value_and_retries_after_ttl(cache, clock, source):
+    cache.get('pbp', source.fetch, TTL)
+    source.fail = True
+    source.release.set()
+
+    clock.now = TTL + 1
+    assert version(cache.get('pbp', source.fetch, TTL)) == 1
+    cache.join()
+    assert source.calls == 2
+    assert cache.stats()['refresh_errors'] == 1
+
+    # Still within the TTL that restarted at the failure: no new fetch
+    clock.now = TTL + 1 + TTL - 1
+    assert version(cache.get('pbp', source.fetch, TTL)) == 1
+    cache.join()
+    assert source.calls == 2
+
+    clock.now = TTL + 1 + TTL
+    source.fail = False
+    assert version(cache.get('pbp', source.fetch, TTL)) == 1
+    cache.join()
+    assert source.calls == 3
+    assert version(cache.get('pbp', source.fetch, TTL)) == 3
+
+
+def test_clear_discards_in_flight_refresh(cache, clock, source):
+    cache.get('pbp', source.fetch, TTL)
+    clock.now = TTL + 1
+    cache.get('pbp', source.fetch, TTL)
+    refresh = next(t for t in threading.enumerate() if t.name.startswith('ttl-cache-refresh-'))
+
+    cache.clear()
+    source.release.set()
+    refresh.join()
+
+    assert cache.stats()['refreshes'] == 0
+    assert version(cache.get('pbp', source.fetch, TTL)) == 3
+    assert cache.stats()['misses'] == 1
+
+
+def test_season_ttl_is_permanent_for_finished_seasons():
+    offseason = datetime.date(2026, 5, 1)
+    ttl = season_ttl(TTL, today=lambda: offseason)
+
+    assert season_finished(2025, offseason)
+    assert ttl(2025) is None
+    assert ttl(2010) is None
+    assert ttl(2026) == TTL
+
+    playoffs = datetime.date(2026, 1, 20)
+    assert season_ttl(TTL, today=lambda: playoffs)(2025) == TTL
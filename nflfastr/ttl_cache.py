@@ -0,0 +1,198 @@
+import datetime
+import functools
+import sys
+import threading
+import time
+
+# --- TTL Policy ---
+
+# In-season data changes weekly (PBP after each game, schedule with flexes),
+# finished seasons are final and never expire.
+CURRENT_SEASON_PBP_TTL = 15 * 60
+CURRENT_SEASON_SCHEDULE_TTL = 60 * 60
+
+# The Super Bowl is played in early/mid February; after this date in year + 1
+# the season's data no longer changes.
+SEASON_FINAL_MONTH_DAY = (2, 20)
+
+
+def season_finished(year, today=None):
+    """Returns True once the season starting in `year` (including playoffs) is over."""
+    today = today or datetime.date.today()
+    month, day = SEASON_FINAL_MONTH_DAY
+    return today > datetime.date(year + 1, month, day)
+
+
+def season_ttl(current_ttl, today=None):
+    """TTL policy keyed on the first argument (season year).
+
+    Seasons in progress or not yet played get current_ttl; finished seasons
+    never expire, so offseason views of last season are not re-downloaded.
+    `today` is a callable returning the date, for testing.
+    """
+    def ttl(year, *args, **kwargs):
+        return None if season_finished(year, today() if today else None) else current_ttl
+    return ttl
+
+
+# --- Stale-While-Revalidate Cache ---
+
+class _Entry:
+    __slots__ = ('value', 'fetched_at', 'ttl', 'refresh_thread')
+
+    def __init__(self, value, fetched_at, ttl):
+        self.value = value
+        self.fetched_at = fetched_at
+        self.ttl = ttl
+        self.refresh_thread = None
+
+
+class TTLCache:
+    """Thread-safe cache that serves expired values while refreshing them in the background.
+
+    A cold miss loads synchronously (one loader per key, concurrent callers wait
+    for it). Once an entry is older than its TTL, callers keep receiving the old
+    value while a single background thread re-fetches it; the new value is
+    swapped in atomically. If the refresh fails the old value is kept and the
+    next refresh is attempted after another TTL. A ttl of None never expires.
+    clear() invalidates loads and refreshes that are still in flight.
+
+    `clock` is injectable so expiry can be driven by a fake clock.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._loading = {}
+        self._generation = 0
+        self._stats = _empty_stats()
+
+    def get(self, key, fetch, ttl=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._is_expired(entry):
+                    self._stats['stale_hits'] += 1
+                    if entry.refresh_thread is None:
+                        self._start_refresh(key, entry, fetch, ttl)
+                else:
+                    self._stats['hits'] += 1
+                return entry.value
+            key_lock = self._loading.setdefault(key, threading.Lock())
+            generation = self._generation
+
+        # Cold miss: only the first caller fetches, the rest wait and reuse its result
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._stats['hits'] += 1
+                    return entry.value
+            value = fetch()
+            with self._lock:
+                if self._loading.get(key) is key_lock:
+                    del self._loading[key]
+                # A clear() during the fetch means this value must not be cached
+                if self._generation == generation:
+                    self._entries[key] = _Entry(value, self._clock(), ttl)
+                    self._stats['misses'] += 1
+            return value
+
+    def join(self, timeout=None):
+        """Waits for in-flight background refreshes to finish."""
+        with self._lock:
+            threads = [e.refresh_thread for e in self._entries.values() if e.refresh_thread is not None]
+        for thread in threads:
+            thread.join(timeout)
+
+    def stats(self):
+        """Returns hit/miss/refresh counters; callers that waited on another's cold load count as hits."""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['stale_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + stats['stale_hits']) / lookups if lookups else None
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._loading.clear()
+            self._generation += 1
+            self._stats = _empty_stats()
+
+    def _is_expired(self, entry):
+        return entry.ttl is not None and self._clock() - entry.fetched_at >= entry.ttl
+
+    def _start_refresh(self, key, entry, fetch, ttl):
+        # Called with self._lock held
+        thread = threading.Thread(
+            target=self._refresh, args=(key, entry, fetch, ttl),
+            name=f"ttl-cache-refresh-{key!r}", daemon=True
+        )
+        entry.refresh_thread = thread
+        thread.start()
+
+    def _refresh(self, key, entry, fetch, ttl):
+        try:
+            value = fetch()
+        except Exception as e:
+            print(f"Background refresh of {key!r} failed, serving stale data: {e}", file=sys.stderr)
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    self._stats['refresh_errors'] += 1
+                entry.fetched_at = self._clock()
+                entry.refresh_thread = None
+            return
+
+        with self._lock:
+            # Only swap in if the entry was not cleared while refreshing
+            if self._entries.get(key) is entry:
+                self._entries[key] = _Entry(value, self._clock(), ttl)
+                self._stats['refreshes'] += 1
+
+
+def _empty_stats():
+    return {'hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0, 'refresh_errors': 0}
+
+
+# Caches live here rather than on the decorated function so they survive
+# Streamlit re-executing the app script on every rerun.
+_CACHES = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def ttl_cache(ttl=None):
+    """Decorator caching a loader in a TTLCache keyed on its arguments.
+
+    `ttl` is either a number of seconds, None (never expire) or a callable that
+    receives the loader's arguments and returns one of those, e.g. season_ttl().
+    """
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+        with _CACHES_LOCK:
+            cache = _CACHES.setdefault(name, TTLCache())
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = args + tuple(sorted(kwargs.items()))
+            entry_ttl = ttl(*args, **kwargs) if callable(ttl) else ttl
+            return cache.get(key, lambda: func(*args, **kwargs), entry_ttl)
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+
+def cache_stats():
+    """Returns stats for every ttl_cache-decorated loader, keyed by qualified name."""
+    with _CACHES_LOCK:
+        caches = dict(_CACHES)
+    return {name: cache.stats() for name, cache in caches.items()}
+
+
+def clear_caches():
+    with _CACHES_LOCK:
+        caches = list(_CACHES.values())
+    for cache in caches:
+        cache.clear()